@@ -9,10 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from notes_manager import NotesManager
 
 def main():
-    nm = NotesManager()
-    
-    # Clear existing notes
-    nm.notes = []
+    nm = NotesManager.get()
     
     # Add sample notes
     sample_notes = [
@@ -27,13 +24,18 @@ def main():
     ]
     
     print("Adding sample notes...")
-    for note_text in sample_notes:
-        nm.add_note(note_text)
-        print(f"  ✓ {note_text}")
-    
-    # Mark a couple as done
-    nm.toggle_note(1)  # First note
-    nm.toggle_note(3)  # Third note
+    with nm.batch():
+        # Clear existing notes
+        nm.clear_notes()
+        
+        added = []
+        for note_text in sample_notes:
+            added.append(nm.add_note(note_text))
+            print(f"  ✓ {note_text}")
+        
+        # Mark a couple as done
+        nm.toggle_note(added[0]['id'])  # First note
+        nm.toggle_note(added[2]['id'])  # Third note
     
     print(f"\nCreated {len(nm.notes)} sample notes")
     print(f"  • {len(nm.get_undone_notes())} undone")
@@ -36,7 +36,7 @@ echo
 
 # Initialize empty notes file
 if [ ! -f "$CONFIG_DIR/notes.json" ]; then
-    echo "[]" > "$CONFIG_DIR/notes.json"
+    echo '{"next_id": 1, "notes": []}' > "$CONFIG_DIR/notes.json"
     echo "✓ Created notes database at $CONFIG_DIR/notes.json"
 else
     echo "✓ Notes database already exists"
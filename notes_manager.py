@@ -4,31 +4,203 @@ Notes Manager - Backend for storing and managing notes
 """
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
 NOTES_FILE = Path.home() / ".config" / "waybar-notes" / "notes.json"
+UNDONE_FILE = NOTES_FILE.with_suffix(".undone.json")  # Undone notes only, for the Waybar module
+SAVE_DELAY = 0.25  # Seconds to wait before writing, so bursts of changes coalesce
+
+# Parsed notes per file, reused while its (mtime_ns, size) fingerprint is unchanged
+_CACHE = {}
+
+# Shared managers handed out by NotesManager.get(), one per notes file
+_INSTANCES = {}
+
+def _atomic_write(path, data, durable=True):
+    """Write bytes to a sibling temp file, then rename it over path (fsync'd first if durable)"""
+    path = path.resolve()  # Replace a symlink's target, not the link itself
+    try:
+        mode = os.stat(path).st_mode & 0o777  # Keep an existing file's permissions
+    except FileNotFoundError:
+        mode = 0o600
+    # Unique per writer, so concurrent saves can't rename each other's temp file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _fingerprint(path):
+    """Cheap change detector for a file: (mtime_ns, size)"""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
 
 class NotesManager:
-    def __init__(self):
-        self.notes_file = NOTES_FILE
+    def __init__(self, notes_file=NOTES_FILE):
+        self.notes_file = Path(notes_file)
+        self.undone_file = self.notes_file.with_suffix(".undone.json")
         self.notes_file.parent.mkdir(parents=True, exist_ok=True)
+        self._next_id = 1
         self.notes = self.load_notes()
+        self._build_index()
+        self._dirty = False
+        self._save_pending = False
+        self._suspend = 0  # Depth of nested batch() blocks
+        self._timer = None
+        self._save_error = None  # Exception a background save failed with, if any
+        self._lock = threading.Lock()  # Guards the save flags and timer
+        self._write_lock = threading.Lock()  # Serialises writes, so saves land in order
+    
+    @classmethod
+    def get(cls, notes_file=NOTES_FILE):
+        """Return the process-wide manager for notes_file, creating it on first use"""
+        path = Path(notes_file)
+        nm = _INSTANCES.get(path)
+        if nm is None:
+            nm = _INSTANCES[path] = cls(path)
+        return nm
     
     def load_notes(self):
-        """Load notes from JSON file"""
-        if self.notes_file.exists():
-            try:
-                with open(self.notes_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return []
-        return []
+        """Load notes from JSON file, reusing the cached parse if unchanged"""
+        try:
+            fingerprint = _fingerprint(self.notes_file)
+        except FileNotFoundError:
+            return []
+        
+        cached = _CACHE.get(self.notes_file)
+        if cached and cached[0] == fingerprint:
+            self._next_id = cached[1]
+            # Copies, so managers sharing the cache never share note dicts
+            return [dict(n) for n in cached[2]]
+        
+        try:
+            data = json.loads(self.notes_file.read_bytes())
+        except json.JSONDecodeError:
+            return []
+        if isinstance(data, list):  # Old format: a bare list of notes
+            data = {'next_id': 1, 'notes': data}
+        if not isinstance(data, dict) or not isinstance(data.get('notes', []), list):
+            return []  # Unrecognised shape, treated like unparseable JSON
+        next_id = data.get('next_id', 1)
+        notes = data.get('notes', [])
+        self._next_id = next_id
+        _CACHE[self.notes_file] = (fingerprint, next_id, [dict(n) for n in notes])
+        return list(notes)
+    
+    def _build_index(self):
+        """Index notes by id and position, partition them by status and reserve the next free id"""
+        self._by_id = {n['id']: n for n in self.notes}
+        self._pos = {n['id']: i for i, n in enumerate(self.notes)}
+        self._undone = [n for n in self.notes if not n['done']]
+        self._done = [n for n in self.notes if n['done']]
+        self._next_id = max(self._next_id, max(self._by_id, default=0) + 1)
+    
+    def _bucket(self, note):
+        """Partition list a note currently belongs to"""
+        return self._done if note['done'] else self._undone
+    
+    def _insert_ordered(self, bucket, note):
+        """Insert note into bucket, keeping notes in file order"""
+        pos = self._pos
+        target = pos[note['id']]
+        lo, hi = 0, len(bucket)
+        while lo < hi:  # Binary search on file position; bisect's key= needs Python 3.10
+            mid = (lo + hi) // 2
+            if pos[bucket[mid]['id']] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        bucket.insert(lo, note)
     
     def save_notes(self):
         """Save notes to JSON file"""
-        with open(self.notes_file, 'w') as f:
-            json.dump(self.notes, f, indent=2)
+        with self._write_lock:
+            with self._lock:
+                if self._suspend:
+                    # Inside batch(); the outermost block writes on exit
+                    self._dirty = True
+                    return
+                if self._timer:
+                    self._timer.cancel()
+                    self._timer = None
+                self._save_pending = False
+                self._dirty = False
+                # Snapshot only; serialising and writing happen outside the lock,
+                # so edits on the UI thread never wait for the disk
+                next_id = self._next_id
+                notes = [dict(n) for n in self.notes]
+                undone = [dict(n) for n in self._undone]
+            
+            try:
+                data = {'next_id': next_id, 'notes': notes}
+                _atomic_write(self.notes_file, json.dumps(data, indent=2).encode())
+                _CACHE[self.notes_file] = (_fingerprint(self.notes_file), next_id, notes)
+                # Written after notes.json, so a current sidecar is never older than it.
+                # Not fsync'd: Waybar falls back to notes.json if it is stale or missing.
+                _atomic_write(self.undone_file, json.dumps(undone).encode(), durable=False)
+            except BaseException:
+                with self._lock:
+                    self._dirty = True  # Still unsaved; the next save retries it
+                raise
+            self._save_error = None
+    
+    @contextmanager
+    def batch(self):
+        """Defer saving until the outermost block exits, then write once"""
+        self._suspend += 1
+        try:
+            yield self
+        finally:
+            self._suspend -= 1
+            if not self._suspend:
+                self.flush()
+    
+    def _mark_dirty(self):
+        """Schedule a debounced save"""
+        self._raise_save_error()
+        with self._lock:
+            self._dirty = True
+            if self._suspend or self._save_pending:
+                return
+            self._save_pending = True
+            self._timer = threading.Timer(SAVE_DELAY, self._background_flush)
+            self._timer.start()
+    
+    def flush(self):
+        """Write pending changes now, re-raising a failed background save"""
+        self._raise_save_error()
+        self._flush()
+    
+    def _flush(self):
+        """Write pending changes, if any"""
+        if self._dirty:
+            self.save_notes()
+    
+    def _background_flush(self):
+        """Timer callback: flush, keeping any error for the thread making changes"""
+        try:
+            self._flush()
+        except Exception as e:
+            self._save_error = e
+            if not threading.main_thread().is_alive():
+                raise  # Exit-time save; nobody is left to re-raise it
+    
+    def _raise_save_error(self):
+        """Re-raise, on the calling thread, the error a background save failed with"""
+        error, self._save_error = self._save_error, None
+        if error is not None:
+            raise error
     
     def add_note(self, text):
         """Add a new note"""
@@ -39,46 +211,62 @@ class NotesManager:
             'created': datetime.now().isoformat(),
             'completed': None
         }
+        self._pos[note['id']] = len(self.notes)
         self.notes.append(note)
-        self.save_notes()
+        self._by_id[note['id']] = note
+        self._undone.append(note)
+        self._mark_dirty()
         return note
     
     def toggle_note(self, note_id):
         """Toggle note done status"""
-        for note in self.notes:
-            if note['id'] == note_id:
-                note['done'] = not note['done']
-                note['completed'] = datetime.now().isoformat() if note['done'] else None
-                self.save_notes()
-                return True
-        return False
+        note = self._by_id.get(note_id)
+        if note is None:
+            return False
+        self._bucket(note).remove(note)
+        note['done'] = not note['done']
+        note['completed'] = datetime.now().isoformat() if note['done'] else None
+        self._insert_ordered(self._bucket(note), note)
+        self._mark_dirty()
+        return True
     
     def delete_note(self, note_id):
         """Delete a note"""
-        self.notes = [n for n in self.notes if n['id'] != note_id]
-        self.save_notes()
+        note = self._by_id.pop(note_id, None)
+        if note is not None:
+            self.notes.remove(note)
+            self._bucket(note).remove(note)
+            # Later notes moved up a slot
+            self._pos = {n['id']: i for i, n in enumerate(self.notes)}
+            self._mark_dirty()
+    
+    def clear_notes(self):
+        """Delete all notes"""
+        self.notes = []
+        self._build_index()
+        self._mark_dirty()
     
     def get_undone_notes(self):
         """Get all undone notes"""
-        return [n for n in self.notes if not n['done']]
+        return self._undone
     
     def get_done_notes(self):
         """Get all done notes"""
-        return [n for n in self.notes if n['done']]
+        return self._done
     
     def get_all_notes(self):
         """Get all notes"""
         return self.notes
     
     def _generate_id(self):
-        """Generate unique ID for note"""
-        if not self.notes:
-            return 1
-        return max(n['id'] for n in self.notes) + 1
+        """Generate unique ID for note; ids are never reused, even after deletes"""
+        note_id = self._next_id
+        self._next_id += 1
+        return note_id
 
 if __name__ == "__main__":
     # Test the notes manager
-    nm = NotesManager()
+    nm = NotesManager.get()
     print(f"Loaded {len(nm.notes)} notes")
     print(f"Undone: {len(nm.get_undone_notes())}")
     print(f"Done: {len(nm.get_done_notes())}")
@@ -4,6 +4,7 @@ Notes Manager TUI - Terminal interface for managing notes
 """
 import curses
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
 
@@ -11,15 +12,43 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent))
 from notes_manager import NotesManager
 
+CHECKBOX = ("☐", "☑")  # Indexed by note['done']
+
+PRINTABLE = range(32, 127)  # Keys accepted as note text
+UTF8_BYTES = range(0x80, 0x100)  # getch() delivers non-ASCII input one UTF-8 byte at a time
+
+# Normal-mode key bindings
+KEYMAP = {
+    ord('q'): 'quit', ord('Q'): 'quit',
+    curses.KEY_UP: 'up', ord('k'): 'up',
+    curses.KEY_DOWN: 'down', ord('j'): 'down',
+    9: 'tab',
+    ord(' '): 'toggle',
+    ord('n'): 'new', ord('N'): 'new',
+    ord('d'): 'delete', ord('D'): 'delete',
+}
+
 class NotesTUI:
     def __init__(self, stdscr):
         self.stdscr = stdscr
-        self.nm = NotesManager()
+        self.nm = None  # Set by the loader thread once the notes are read
+        self._load_error = None  # Exception the loader thread failed with, if any
+        self._loader = threading.Thread(target=self.load_notes, daemon=True)
+        self._loader.start()
         self.current_tab = 0  # 0 = Undone, 1 = Done, 2 = All
         self.selected_idx = 0
         self.scroll_offset = 0
         self.input_mode = False
-        self.input_buffer = ""
+        self.input_buffer = bytearray()  # Raw UTF-8 bytes of the note being typed
+        self._input_text = ""  # Decoded input_buffer, None once it is stale
+        self._dirty = True  # Redraw needed
+        self._selection_moved = False  # Only the selected row changed since the last draw
+        self._drawn_selected_idx = 0  # selected_idx as of the last draw
+        self._pad_key = None  # (notes_version, tab, width) the pad was filled for
+        self.notes_version = 0  # Bumped whenever the notes are modified
+        self._cached_notes = []  # Current tab's notes as of the last redraw
+        self._display_cache = {}  # (width, note id, done) -> formatted line
+        self._display_version = 0  # notes_version the display cache was built for
         
         # Initialize colors
         curses.start_color()
@@ -32,19 +61,42 @@ class NotesTUI:
         
         curses.curs_set(0)  # Hide cursor
         self.stdscr.keypad(True)
-        self.stdscr.timeout(100)  # Non-blocking with 100ms timeout
-        
-        # Enable flicker-free updates
+        self.stdscr.timeout(50)  # Poll until the notes are loaded, then block in getch()
+        self.create_windows()
+    
+    def create_windows(self):
+        """Split the screen into header, notes pad and footer"""
+        height, width = self.stdscr.getmaxyx()
+        footer_rows = min(3, height)
+        self.header_win = curses.newwin(min(4, height), width, 0, 0)
+        self.footer_win = curses.newwin(footer_rows, width, height - footer_rows, 0)
+        self.notes_pad = curses.newpad(max(height, 3), width)
+        self._pad_key = None
+    
+    def load_notes(self):
+        """Load the notes off the UI thread so the first frame isn't held up"""
         try:
-            curses.cbreak()
-            self.stdscr.nodelay(False)
-            self.stdscr.timeout(100)
-        except:
-            pass
+            self.nm = NotesManager.get()
+        except Exception as e:
+            # Raised again on the UI thread, where curses can restore the terminal first
+            self._load_error = e
+    
+    def wait_for_notes(self):
+        """Block until the loader has finished, re-raising anything it failed with"""
+        self._loader.join()
+        if self._load_error is not None:
+            raise self._load_error
+    
+    def notes_loaded(self):
+        """Switch to blocking input and redraw once the loader has finished"""
+        self.stdscr.timeout(-1)  # Resizes still wake getch() as KEY_RESIZE
+        self.notes_changed()
     
     def get_current_notes(self):
         """Get notes for current tab"""
-        if self.current_tab == 0:
+        if self.nm is None:
+            return []
+        elif self.current_tab == 0:
             return self.nm.get_undone_notes()
         elif self.current_tab == 1:
             return self.nm.get_done_notes()
@@ -53,200 +105,294 @@ class NotesTUI:
     
     def draw_header(self):
         """Draw the header with tabs"""
-        height, width = self.stdscr.getmaxyx()
+        win = self.header_win
+        win.erase()
+        width = win.getmaxyx()[1]
         tabs = ["UNDONE", "DONE", "ALL"]
         
-        self.stdscr.attron(curses.color_pair(4) | curses.A_BOLD)
-        self.stdscr.addstr(0, 0, "═" * width)
-        self.stdscr.addstr(1, 2, "📝 NOTES MANAGER")
-        self.stdscr.attroff(curses.color_pair(4) | curses.A_BOLD)
-        
-        # Draw tabs
-        x_pos = 2
-        for i, tab in enumerate(tabs):
-            if i == self.current_tab:
-                self.stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
-                self.stdscr.addstr(2, x_pos, f" {tab} ")
-                self.stdscr.attroff(curses.color_pair(1) | curses.A_BOLD)
-            else:
-                self.stdscr.addstr(2, x_pos, f" {tab} ")
-            x_pos += len(tab) + 3
+        try:
+            title_attr = curses.color_pair(4) | curses.A_BOLD
+            win.addstr(0, 0, "═" * width, title_attr)
+            win.addstr(1, 2, "📝 NOTES MANAGER", title_attr)
+            
+            # Draw tabs
+            x_pos = 2
+            for i, tab in enumerate(tabs):
+                attr = curses.color_pair(1) | curses.A_BOLD if i == self.current_tab else curses.A_NORMAL
+                win.addstr(2, x_pos, f" {tab} ", attr)
+                x_pos += len(tab) + 3
+            
+            win.addstr(3, 0, "─" * width, curses.color_pair(4))  # Fills the window's last cell
+        except curses.error:
+            pass  # Terminal too small, or the rule filled the last cell
         
-        self.stdscr.attron(curses.color_pair(4))
-        self.stdscr.addstr(3, 0, "─" * width)
-        self.stdscr.attroff(curses.color_pair(4))
+        win.noutrefresh()
     
-    def draw_notes(self):
+    def draw_notes(self, notes):
         """Draw the list of notes"""
         height, width = self.stdscr.getmaxyx()
-        notes = self.get_current_notes()
         
-        # Calculate visible area
-        visible_start = 4
-        visible_height = height - 7  # Leave space for header and footer
+        # The pad holds every row of the tab; only rebuild it when those rows change
+        pad_key = (self.notes_version, self.current_tab, width)
+        if pad_key != self._pad_key:
+            self._pad_key = pad_key
+            self.fill_pad(notes, width)
+        
+        self.update_selection(notes, width)
+        self.show_viewport(height, width)
+    
+    def fill_pad(self, notes, width):
+        """Write every note of the current tab into the pad"""
+        pad = self.notes_pad
+        pad.erase()
         
         if not notes:
-            msg = "No notes in this category"
-            self.stdscr.addstr(visible_start + 2, (width - len(msg)) // 2, msg, curses.A_DIM)
+            msg = "Loading…" if self.nm is None else "No notes in this category"
+            try:
+                pad.addstr(2, max(0, (width - len(msg)) // 2), msg, curses.A_DIM)
+            except curses.error:
+                pass
             return
         
+        if pad.getmaxyx()[0] < len(notes):
+            pad.resize(len(notes), width)
+        
+        # Formatted rows are only valid for the notes they were built from
+        if self._display_version != self.notes_version:
+            self._display_cache.clear()
+            self._display_version = self.notes_version
+        
+        for note_idx, note in enumerate(notes):
+            self.draw_row(note_idx, note, width)
+        self._drawn_selected_idx = self.selected_idx
+    
+    def draw_row(self, note_idx, note, width):
+        """Draw a single note into its row of the pad"""
+        pad = self.notes_pad
+        
+        # Determine display attributes
+        is_selected = note_idx == self.selected_idx
+        is_done = note['done']
+        attr = curses.color_pair(1 if is_selected else 2 if is_done else 3)
+        
+        key = (width, note['id'], is_done)
+        line = self._display_cache.get(key)
+        if line is None:
+            line = self._display_cache[key] = self.format_line(note, width)
+        
+        try:
+            pad.addstr(note_idx, 0, line, attr)
+        except curses.error:
+            pass
+    
+    def update_selection(self, notes, width):
+        """Move the highlight from the previously drawn selection to the current one"""
+        if self._drawn_selected_idx == self.selected_idx:
+            return
+        for note_idx in (self._drawn_selected_idx, self.selected_idx):
+            if note_idx < len(notes):
+                self.draw_row(note_idx, notes[note_idx], width)
+        self._drawn_selected_idx = self.selected_idx
+    
+    def show_viewport(self, height, width):
+        """Scroll the selection into view and stage that window of the pad"""
+        visible_start = 4
+        visible_height = height - 7  # Leave space for header and footer
+        if visible_height <= 0:
+            return  # No room for notes between header and footer
+        
         # Adjust scroll offset
         if self.selected_idx < self.scroll_offset:
             self.scroll_offset = self.selected_idx
         elif self.selected_idx >= self.scroll_offset + visible_height:
             self.scroll_offset = self.selected_idx - visible_height + 1
         
-        # Draw visible notes
-        for i in range(visible_height):
-            note_idx = i + self.scroll_offset
-            if note_idx >= len(notes):
-                break
-            
-            note = notes[note_idx]
-            y_pos = visible_start + i
-            
-            # Determine display attributes
-            is_selected = note_idx == self.selected_idx
-            is_done = note['done']
-            
-            if is_selected:
-                self.stdscr.attron(curses.color_pair(1))
-            elif is_done:
-                self.stdscr.attron(curses.color_pair(2))
-            else:
-                self.stdscr.attron(curses.color_pair(3))
-            
-            # Format the line
-            checkbox = "☑" if is_done else "☐"
-            text = note['text']
-            max_text_len = width - 8
-            if len(text) > max_text_len:
-                text = text[:max_text_len-3] + "..."
-            
-            line = f" {checkbox} {text}"
-            line = line.ljust(width - 1)
-            
-            try:
-                self.stdscr.addstr(y_pos, 0, line)
-            except curses.error:
-                pass
-            
-            if is_selected:
-                self.stdscr.attroff(curses.color_pair(1))
-            elif is_done:
-                self.stdscr.attroff(curses.color_pair(2))
-            else:
-                self.stdscr.attroff(curses.color_pair(3))
+        # Rows past the last note must exist too, or stale screen rows would show through
+        rows = self.scroll_offset + visible_height
+        if self.notes_pad.getmaxyx()[0] < rows:
+            self.notes_pad.resize(rows, width)
+        
+        self.notes_pad.noutrefresh(self.scroll_offset, 0, visible_start, 0, height - 4, width - 1)
     
-    def draw_footer(self):
-        """Draw the footer with help text"""
+    def move_selection(self):
+        """Repaint only the notes area after the selection moved"""
         height, width = self.stdscr.getmaxyx()
+        self.update_selection(self._cached_notes, width)
+        self.show_viewport(height, width)
+        curses.doupdate()
+    
+    def format_line(self, note, width):
+        """Format a note as a full-width row"""
+        checkbox = CHECKBOX[note['done']]
+        text = note['text']
+        max_text_len = width - 8
+        if len(text) > max_text_len:
+            text = text[:max_text_len-3] + "..."
         
-        self.stdscr.attron(curses.color_pair(4))
-        self.stdscr.addstr(height - 3, 0, "─" * width)
-        self.stdscr.attroff(curses.color_pair(4))
+        line = f" {checkbox} {text}"
+        return line.ljust(width - 1)
+    
+    def draw_footer(self, notes):
+        """Draw the footer with help text"""
+        win = self.footer_win
+        win.erase()
+        width = win.getmaxyx()[1]
         
-        if self.input_mode:
-            self.stdscr.addstr(height - 2, 2, "New note: " + self.input_buffer + "█")
-            self.stdscr.addstr(height - 1, 2, "Enter: Save | Esc: Cancel", curses.A_DIM)
-        else:
-            help_text = "↑/↓: Navigate | Tab: Switch view | Space: Toggle | N: New | D: Delete | Q: Quit"
-            if len(help_text) <= width - 4:
-                self.stdscr.addstr(height - 2, 2, help_text, curses.A_DIM)
+        try:
+            win.addstr(0, 0, "─" * width, curses.color_pair(4))
             
-            notes = self.get_current_notes()
-            count_text = f"Showing {len(notes)} note{'s' if len(notes) != 1 else ''}"
-            self.stdscr.addstr(height - 1, 2, count_text, curses.A_DIM)
+            if self.input_mode:
+                win.addstr(1, 2, "New note: " + self.input_text() + "█")
+                win.addstr(2, 2, "Enter: Save | Esc: Cancel", curses.A_DIM)
+            else:
+                help_text = "↑/↓: Navigate | Tab: Switch view | Space: Toggle | N: New | D: Delete | Q: Quit"
+                if len(help_text) <= width - 4:
+                    win.addstr(1, 2, help_text, curses.A_DIM)
+                
+                count_text = f"Showing {len(notes)} note{'s' if len(notes) != 1 else ''}"
+                win.addstr(2, 2, count_text, curses.A_DIM)
+        except curses.error:
+            pass  # Terminal too small for the whole footer
+        
+        win.noutrefresh()
     
     def draw_input_mode(self):
         """Draw input mode overlay"""
         curses.curs_set(1)  # Show cursor
     
+    def input_text(self):
+        """Decode the input buffer, reusing the last result if it hasn't changed"""
+        if self._input_text is None:
+            self._input_text = self.input_buffer.decode('utf-8', errors='replace')
+        return self._input_text
+    
+    def clear_input(self):
+        """Empty the input buffer"""
+        self.input_buffer.clear()
+        self._input_text = ""
+    
+    def notes_changed(self):
+        """Record that the notes were modified"""
+        self.notes_version += 1
+        self._dirty = True
+    
     def handle_input(self):
         """Handle keyboard input"""
         key = self.stdscr.getch()
         
-        if key == -1:  # No input
+        if key == -1:  # Timed out while loading
+            return True
+        
+        if key == curses.KEY_RESIZE:
+            self.create_windows()
+            self._display_cache.clear()
+            self._dirty = True
             return True
         
         if self.input_mode:
+            self._dirty = True  # Every key edits the input line
             if key == 27:  # Escape
                 self.input_mode = False
-                self.input_buffer = ""
+                self.clear_input()
                 curses.curs_set(0)
             elif key == 10 or key == curses.KEY_ENTER:  # Enter
-                if self.input_buffer.strip():
-                    self.nm.add_note(self.input_buffer.strip())
-                    self.input_buffer = ""
+                text = self.input_text().strip()
+                if text:
+                    self.wait_for_notes()
+                    self.nm.add_note(text)
+                    self.notes_changed()
+                    self.clear_input()
                 self.input_mode = False
                 curses.curs_set(0)
                 self.selected_idx = 0
                 self.scroll_offset = 0
             elif key == curses.KEY_BACKSPACE or key == 127:
-                self.input_buffer = self.input_buffer[:-1]
-            elif 32 <= key <= 126:  # Printable characters
-                self.input_buffer += chr(key)
+                # Drop the last character, including all bytes of a multi-byte one
+                buf = self.input_buffer
+                while buf and buf[-1] & 0xC0 == 0x80:
+                    del buf[-1]
+                del buf[-1:]
+                self._input_text = None
+            elif key in PRINTABLE or key in UTF8_BYTES:
+                self.input_buffer.append(key)
+                self._input_text = None
         else:
-            notes = self.get_current_notes()
+            action = KEYMAP.get(key)
+            if action is None:
+                return True
+            notes = self._cached_notes
             
-            if key == ord('q') or key == ord('Q'):
+            if action == 'quit':
                 return False
-            elif key == curses.KEY_UP or key == ord('k'):
+            elif action == 'up':
                 if notes and self.selected_idx > 0:
                     self.selected_idx -= 1
-            elif key == curses.KEY_DOWN or key == ord('j'):
+                    self._selection_moved = True
+            elif action == 'down':
                 if notes and self.selected_idx < len(notes) - 1:
                     self.selected_idx += 1
-            elif key == 9:  # Tab
+                    self._selection_moved = True
+            elif action == 'tab':
                 self.current_tab = (self.current_tab + 1) % 3
                 self.selected_idx = 0
                 self.scroll_offset = 0
-            elif key == ord(' '):  # Space - toggle
+                self._dirty = True
+            elif action == 'toggle':
                 if notes:
                     note = notes[self.selected_idx]
                     self.nm.toggle_note(note['id'])
-            elif key == ord('n') or key == ord('N'):
+                    self.notes_changed()
+            elif action == 'new':
                 self.input_mode = True
-                self.input_buffer = ""
-            elif key == ord('d') or key == ord('D'):
+                self.clear_input()
+                self._dirty = True
+            elif action == 'delete':
                 if notes:
                     note = notes[self.selected_idx]
                     self.nm.delete_note(note['id'])
-                    if self.selected_idx >= len(self.get_current_notes()):
-                        self.selected_idx = max(0, len(self.get_current_notes()) - 1)
+                    self.notes_changed()
+                    # notes is the live list for this tab, so it already lacks the deleted note
+                    if self.selected_idx >= len(notes):
+                        self.selected_idx = max(0, len(notes) - 1)
         
         return True
     
     def run(self):
         """Main loop"""
         running = True
-        last_state = None
+        
+        loading = True
         
         while running:
-            # Only redraw if something changed
-            current_state = (
-                self.current_tab,
-                self.selected_idx,
-                self.scroll_offset,
-                self.input_mode,
-                self.input_buffer,
-                len(self.get_current_notes())
-            )
+            if loading and not self._loader.is_alive():
+                loading = False
+                self.wait_for_notes()
+                self.notes_loaded()
             
-            if current_state != last_state:
-                self.stdscr.erase()  # Use erase() instead of clear()
+            # Arrow-key moves only touch the notes pad; anything else redraws every window
+            if self._selection_moved and not self._dirty:
+                self.move_selection()
+            self._selection_moved = False
+            
+            # Only redraw if something changed
+            if self._dirty:
+                notes = self._cached_notes = self.get_current_notes()
                 
                 try:
+                    # Stage every window, then flush them in one update
+                    self.stdscr.noutrefresh()
                     self.draw_header()
-                    self.draw_notes()
-                    self.draw_footer()
-                    self.stdscr.refresh()
-                    last_state = current_state
+                    self.draw_notes(notes)
+                    self.draw_footer(notes)
+                    curses.doupdate()
+                    self._dirty = False
                 except KeyboardInterrupt:
                     running = False
             
             running = self.handle_input() and running
         
+        if self.nm is not None:
+            self.nm.flush()  # Save now, so a failed background save is reported
         curses.curs_set(1)  # Show cursor before exit
 
 def main(stdscr):
@@ -2,18 +2,37 @@
 """
 Waybar Notes Module - Displays cycling undone notes
 """
-import json
+import os
 import sys
 from pathlib import Path
 import time
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the standard library
+    import json
+    _dumps = lambda obj: json.dumps(obj).encode()
+    _loads = json.loads
+
 # Add notes_manager to path
 sys.path.insert(0, str(Path(__file__).parent))
-from notes_manager import NotesManager
+from notes_manager import NOTES_FILE, UNDONE_FILE, NotesManager
+
+CYCLE_SECONDS = 10  # How long each undone note stays in the bar
+
+# Last output, reused until the notes change or the cycle moves on. Only kept in
+# the private per-user runtime dir; a shared temp dir would let others plant one.
+_RUNTIME_DIR = os.environ.get("XDG_RUNTIME_DIR")
+CACHE_FILE = Path(_RUNTIME_DIR) / "waybar_notes.cache" if _RUNTIME_DIR else None
+
+# Pango markup escapes, applied in a single pass by escape_text
+ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
 
 def escape_text(text):
     """Escape special characters for Waybar"""
-    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    return text.translate(ESCAPE_TABLE)
 
 def truncate_text(text, max_length=50):
     """Truncate text if too long"""
@@ -21,9 +40,50 @@ def truncate_text(text, max_length=50):
         return text
     return text[:max_length-3] + "..."
 
+def load_undone():
+    """Read undone notes from the sidecar NotesManager writes, falling back to notes.json"""
+    try:
+        # Only trust the sidecar if notes.json hasn't been written since
+        if os.stat(UNDONE_FILE).st_mtime_ns >= os.stat(NOTES_FILE).st_mtime_ns:
+            return _loads(UNDONE_FILE.read_bytes())
+    except (OSError, ValueError):
+        pass
+    return NotesManager.get().get_undone_notes()
+
+def cache_key(slot):
+    """Identify an output by the notes files' mtimes and the cycle slot it was built for"""
+    stamps = []
+    for path in (NOTES_FILE, UNDONE_FILE):
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamps.append(0)
+    return f"{stamps[0]}:{stamps[1]}:{slot}".encode()
+
+def write_cache(key, data):
+    """Store output for later ticks; the cache is best-effort"""
+    if CACHE_FILE is None:
+        return
+    tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(key + b"\n" + data)
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass
+
 def main():
-    nm = NotesManager()
-    undone = nm.get_undone_notes()
+    slot = int(time.time() / CYCLE_SECONDS)
+    key = cache_key(slot)
+    if CACHE_FILE is not None:
+        try:
+            cached = CACHE_FILE.read_bytes()
+            if cached.startswith(key + b"\n"):
+                sys.stdout.buffer.write(cached[len(key) + 1:])
+                return
+        except OSError:
+            pass
+    
+    undone = load_undone()
     
     if not undone:
         output = {
@@ -33,8 +93,8 @@ def main():
             "alt": "empty"
         }
     else:
-        # Get current index based on time (cycle every 10 seconds)
-        current_index = int(time.time() / 10) % len(undone)
+        # Get current index based on time (cycle every CYCLE_SECONDS)
+        current_index = slot % len(undone)
         current_note = undone[current_index]
         
         # Build tooltip with all undone notes
@@ -50,7 +110,9 @@ def main():
             "alt": "active"
         }
     
-    print(json.dumps(output))
+    data = _dumps(output) + b"\n"
+    sys.stdout.buffer.write(data)
+    write_cache(key, data)
 
 if __name__ == "__main__":
     main()